@@ -4,6 +4,7 @@ Ring Device Debug Script - See what devices are available
 """
 
 import os
+import sys
 from dotenv import load_dotenv
 from ring_doorbell import Ring, Auth
 
@@ -12,67 +13,78 @@ load_dotenv()
 RING_USERNAME = os.getenv('RING_USERNAME')
 RING_PASSWORD = os.getenv('RING_PASSWORD')
 
-print("Authenticating with Ring...")
-auth = Auth("RingDebug/1.0", None)
+# Ring attributes worth inspecting (dir() on a Ring object resolves every property)
+RING_ATTRS = ('devices', 'doorbots', 'stickup_cams', 'chimes', 'other', 'session')
+DEVICE_ATTRS = ('doorbots', 'stickup_cams', 'chimes', 'other', 'devices', 'all_devices')
 
-try:
-    auth.fetch_token(RING_USERNAME, RING_PASSWORD)
-except:
-    code = input("Enter 2FA code: ")
-    auth.fetch_token(RING_USERNAME, RING_PASSWORD, code)
+def main():
+    print("Authenticating with Ring...")
+    auth = Auth("RingDebug/1.0", None)
 
-ring = Ring(auth)
-ring.update_data()
-
-print("\n" + "="*60)
-print("Ring Account Debug Info")
-print("="*60)
+    try:
+        auth.fetch_token(RING_USERNAME, RING_PASSWORD)
+    except:
+        code = input("Enter 2FA code: ")
+        auth.fetch_token(RING_USERNAME, RING_PASSWORD, code)
 
-# Check what attributes Ring object has
-print("\nRing object attributes:")
-for attr in dir(ring):
-    if not attr.startswith('_'):
-        print(f"  - {attr}")
+    ring = Ring(auth)
+    ring.update_data()
 
-# Try to get devices
-print("\n" + "="*60)
-print("Attempting to access devices...")
-print("="*60)
+    # Collect the report and write it in one go
+    lines = []
 
-try:
-    devices = ring.devices()
-    print(f"\ndevices() returned type: {type(devices)}")
-    print(f"devices() value: {devices}")
-except Exception as e:
-    print(f"Error calling devices(): {e}")
+    lines.append("\n" + "="*60)
+    lines.append("Ring Account Debug Info")
+    lines.append("="*60)
 
-# Try different device attributes
-print("\n" + "="*60)
-print("Checking for device attributes...")
-print("="*60)
+    # Check which of the interesting attributes Ring object has
+    lines.append("\nRing object attributes:")
+    for attr in RING_ATTRS:
+        if hasattr(ring, attr):
+            lines.append(f"  - {attr}")
 
-device_attrs = ['doorbots', 'stickup_cams', 'chimes', 'other', 'devices', 'all_devices']
+    # Try to get devices
+    lines.append("\n" + "="*60)
+    lines.append("Attempting to access devices...")
+    lines.append("="*60)
 
-for attr in device_attrs:
     try:
-        value = getattr(ring, attr, None)
-        if value is not None:
-            print(f"\n✓ ring.{attr}:")
-            print(f"  Type: {type(value)}")
-            if hasattr(value, '__len__'):
-                print(f"  Count: {len(value)}")
-                if len(value) > 0:
-                    print(f"  First item: {value[0]}")
-                    print(f"  First item type: {type(value[0])}")
-                    if hasattr(value[0], 'name'):
-                        print(f"  First item name: {value[0].name}")
-            else:
-                print(f"  Value: {value}")
-        else:
-            print(f"✗ ring.{attr} is None or doesn't exist")
+        devices = ring.devices()
+        lines.append(f"\ndevices() returned type: {type(devices)}")
+        lines.append(f"devices() value: {devices}")
     except Exception as e:
-        print(f"✗ Error accessing ring.{attr}: {e}")
+        lines.append(f"Error calling devices(): {e}")
+
+    # Try different device attributes
+    lines.append("\n" + "="*60)
+    lines.append("Checking for device attributes...")
+    lines.append("="*60)
+
+    for attr in DEVICE_ATTRS:
+        try:
+            value = getattr(ring, attr, None)
+            if value is not None:
+                lines.append(f"\n✓ ring.{attr}:")
+                lines.append(f"  Type: {type(value)}")
+                if hasattr(value, '__len__'):
+                    lines.append(f"  Count: {len(value)}")
+                    if len(value) > 0:
+                        lines.append(f"  First item: {value[0]}")
+                        lines.append(f"  First item type: {type(value[0])}")
+                        if hasattr(value[0], 'name'):
+                            lines.append(f"  First item name: {value[0].name}")
+                else:
+                    lines.append(f"  Value: {value}")
+            else:
+                lines.append(f"✗ ring.{attr} is None or doesn't exist")
+        except Exception as e:
+            lines.append(f"✗ Error accessing ring.{attr}: {e}")
+
+    lines.append("\n" + "="*60)
+    lines.append("Debug complete!")
+    lines.append("="*60)
+
+    sys.stdout.write('\n'.join(lines) + '\n')
 
-print("\n" + "="*60)
-print("Debug complete!")
-print("="*60)
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -7,9 +7,24 @@ Simple, reliable push notifications - perfect for hobbyists!
 import os
 import time
 import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import random
+import heapq
+import queue
+import threading
+import tempfile
+import shutil
+import atexit
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from ring_doorbell import Ring, Auth
+try:
+    from ring_doorbell.listen import RingEventListener
+except ImportError:  # ring-doorbell installed without the [listen] extra
+    RingEventListener = None
 from oauthlib.oauth2 import MissingTokenError
 from dotenv import load_dotenv
 import requests
@@ -23,31 +38,99 @@ RING_PASSWORD = os.getenv('RING_PASSWORD')
 PUSHOVER_USER_KEY = os.getenv('PUSHOVER_USER_KEY')
 PUSHOVER_API_TOKEN = os.getenv('PUSHOVER_API_TOKEN')
 TOKEN_FILE = 'ring_token.cache'
-CHECK_INTERVAL = 10  # seconds between checks
+FCM_CREDENTIALS_FILE = 'ring_fcm_credentials.cache'  # push notification registration
+CHECK_INTERVAL = 10  # seconds between checks (right after an event)
+MAX_CHECK_INTERVAL = 60  # seconds between checks when idle
+LISTENER_HEARTBEAT_INTERVAL = 60  # seconds between fallback checks while push events work
+BACKOFF_BASE = 1.0  # seconds, first retry delay after an error
+BACKOFF_CAP = 30  # seconds, longest retry delay after errors
+BACKOFF_JITTER = 0.5  # up to +50% random delay so clients don't retry in lockstep
+DEVICES_CACHE_TTL = 60  # seconds to reuse the Ring device list
+DEVICE_CHECK_TIMEOUT = 120  # seconds to wait for all devices to be checked
 DOWNLOAD_VIDEOS = os.getenv('DOWNLOAD_VIDEOS', 'true').lower() == 'true'
 VIDEOS_DIR = os.getenv('VIDEOS_DIR', './ring_videos')
 MAX_STORAGE_GB = float(os.getenv('MAX_STORAGE_GB', '10'))
+HISTORY_LIMIT = 5  # events fetched per device on each check
+ACCOUNT_HISTORY_LIMIT = 15  # minimum events fetched across all devices on each check
+HISTORY_ENDPOINT = '/clients_api/doorbots/history'  # account-wide event history
+SEEN_EVENTS_MAX = 256  # event IDs remembered per device
+FRAME_HEAD_BYTES = 512 * 1024  # bytes of a download to decode the first frame from
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024  # write size when saving videos
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+# Log through a queue so formatting and console I/O happen on a background thread
+logger = logging.getLogger("ring_notif")
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s", handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# Push actions that ring-doorbell's listener can report as the event kind
+_PUSH_KINDS = {
+    'com.ring.push.handle_new_ding': 'ding',
+    'com.ring.push.handle_new_motion': 'motion',
+}
+
+def _local_time(value):
+    """Format an event time (ISO string or datetime) as local time, like push events"""
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        return value.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+    except (AttributeError, ValueError):
+        return value
+
+def _walk(path):
+    """Yield DirEntry objects for all files under path (stat info comes from the directory scan)"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
 
 class RingPushoverNotifier:
     def __init__(self):
         self.ring = None
-        self.last_event_ids = {}
+        self._seen = defaultdict(lambda: deque(maxlen=SEEN_EVENTS_MAX))  # Recent event IDs per device, in order
+        self._seen_set = defaultdict(set)  # Same IDs as _seen, for fast lookup
+        self._seen_lock = threading.Lock()  # Guards _seen between the push listener and poll threads
+        self._safe_names = {}  # Filename-safe device names by device ID
+        self._listener = None  # Push event listener, None when polling only
         self.videos_path = Path(VIDEOS_DIR)
         self.was_connected = True  # Track connection state
         self.consecutive_errors = 0  # Track error count
         self.connection_lost_time = None  # Track when connection was lost
+        self._idle_interval = CHECK_INTERVAL  # Current sleep between checks
+        self._max_interval = MAX_CHECK_INTERVAL
+        self._event_fired = False  # Set by _process_event during a check
+        self._backoff_sleep = None  # Retry delay after a failed check
+        self._pushover_session = requests.Session()  # Keep-alive for Pushover API
+        self._ring_session = requests.Session()  # Keep-alive for Ring video downloads
+        self._devices_cache = None
+        self._devices_cache_time = 0
+        self._pool = ThreadPoolExecutor(max_workers=8)  # Concurrent per-device history calls
+        self._storage_lock = threading.Lock()  # Guards the storage accounting below
+        self._storage_bytes = 0  # Running total of bytes in the videos directory
+        self._video_heap = []  # (mtime, path) of stored videos, oldest first
+        self._video_queue = queue.Queue()  # (device, event, title, need_frame, timestamp) to download
+        threading.Thread(target=self._video_worker, daemon=True).start()
         self.initialize()
     
     def initialize(self):
         """Initialize Ring connection"""
-        print(f"[{datetime.now()}] Initializing Ring Pushover Notifier...")
+        logger.info("Initializing Ring Pushover Notifier...")
         
         # Create videos directory if it doesn't exist
         if DOWNLOAD_VIDEOS:
             self.videos_path.mkdir(parents=True, exist_ok=True)
-            print(f"✓ Videos directory created: {self.videos_path.absolute()}")
+            logger.info("✓ Videos directory created: %s", self.videos_path.absolute())
+            self._scan_storage()
         
-        print("✓ Pushover configured")
+        logger.info("✓ Pushover configured")
         
         # Initialize Ring authentication with token cache
         token_cache = None
@@ -55,9 +138,9 @@ class RingPushoverNotifier:
             try:
                 with open(TOKEN_FILE, 'r') as f:
                     token_cache = json.load(f)
-                print("✓ Found cached token, skipping authentication")
+                logger.info("✓ Found cached token, skipping authentication")
             except Exception as e:
-                print(f"Warning: Could not load cached token: {e}")
+                logger.warning("Could not load cached token: %s", e)
         
         auth = Auth("MyRingPushoverApp/1.0", token_cache, token_updater=self.token_updated)
         
@@ -98,84 +181,221 @@ class RingPushoverNotifier:
         
         self.ring = Ring(auth)
         self.ring.update_data()
-        print("✓ Ring client initialized")
+        logger.info("✓ Ring client initialized")
         
         # List devices
-        devices = self.ring.devices()
+        devices = self._get_devices()
         
         # Access devices correctly - RingDevices acts like a dict
         doorbell_count = len(devices['doorbots']) if 'doorbots' in devices else 0
         camera_count = len(devices['stickup_cams']) if 'stickup_cams' in devices else 0
         
-        print(f"\nFound {doorbell_count} doorbell(s)")
-        print(f"Found {camera_count} camera(s)")
+        logger.info("Found %d doorbell(s)", doorbell_count)
+        logger.info("Found %d camera(s)", camera_count)
         
         # Initialize last event tracking
         self._initialize_event_tracking()
     
     def token_updated(self, token):
         """Callback to save updated Ring token"""
-        with open(TOKEN_FILE, 'w') as f:
-            json.dump(token, f)
-        print(f"[{datetime.now()}] Token updated and saved")
+        self._write_json(TOKEN_FILE, token)
+        # Refetch the device list on next use after re-authentication
+        self._devices_cache = None
+        logger.info("Token updated and saved")
+    
+    def _write_json(self, path, data):
+        """Save JSON via a temp file and rename so a crash can't leave a corrupt file"""
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    
+    def _fcm_credentials_updated(self, credentials):
+        """Callback to save updated push notification credentials"""
+        self._write_json(FCM_CREDENTIALS_FILE, credentials)
+        logger.info("Push credentials updated and saved")
+    
+    def _start_listener(self):
+        """Start receiving Ring push events, returns True if the listener is running"""
+        if RingEventListener is None:
+            logger.info("ℹ ring-doorbell[listen] not installed, using polling only")
+            logger.info("    Install with: pip install 'ring-doorbell[listen]>=0.8.6,<0.9'")
+            return False
+        
+        credentials = None
+        if os.path.exists(FCM_CREDENTIALS_FILE):
+            try:
+                with open(FCM_CREDENTIALS_FILE, 'r') as f:
+                    credentials = json.load(f)
+            except Exception as e:
+                logger.warning("Could not load cached push credentials: %s", e)
+        
+        try:
+            self._listener = RingEventListener(self.ring, credentials, self._fcm_credentials_updated)
+            self._listener.add_notification_callback(self._on_push_event)
+            self._listener.start()
+        except Exception as e:
+            logger.warning("Could not start push event listener: %s", e)
+            self._listener = None
+            return False
+        
+        if not self._listener.started:
+            logger.warning("Push event listener failed to start, using polling only")
+            self._listener = None
+            return False
+        
+        logger.info("✓ Listening for Ring push events")
+        return True
+    
+    def _on_push_event(self, ring_event):
+        """Handle a Ring push event (runs on the listener's thread)"""
+        try:
+            device = next((d for d in self._all_devices() if d.id == ring_event.doorbot_id), None)
+            if device is None:
+                logger.info("Push event %s for unknown device %s", ring_event.id, ring_event.doorbot_id)
+                return
+            
+            # Device added since startup - fetch the history page the poll sees so it
+            # doesn't report older events once this push registers the device
+            history = None
+            if device.id not in self._seen:
+                history = self._fetch_account_history().get(device.id, [])
+            
+            with self._seen_lock:
+                if history is not None and device.id not in self._seen:
+                    for event in history:
+                        if event['id'] != ring_event.id:
+                            self._mark_seen(device.id, event['id'])
+                
+                # The fallback history poll may already have handled this event
+                if ring_event.id in self._seen_set[device.id]:
+                    return
+                self._mark_seen(device.id, ring_event.id)
+            
+            event = {
+                'id': ring_event.id,
+                'kind': _PUSH_KINDS.get(ring_event.kind.lower(), ring_event.kind),
+                'created_at': datetime.fromtimestamp(ring_event.now).strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self._process_event(device, event)
+        except Exception as e:
+            logger.error("Error handling push event: %s", e)
+    
+    def _get_devices(self):
+        """Return Ring devices, reusing the last result for DEVICES_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._devices_cache is None or now - self._devices_cache_time >= DEVICES_CACHE_TTL:
+            self._devices_cache = self.ring.devices()
+            self._devices_cache_time = now
+        return self._devices_cache
+    
+    def _all_devices(self):
+        """Return doorbells and cameras as a single list"""
+        devices = self._get_devices()
+        doorbells = devices['doorbots'] if 'doorbots' in devices else []
+        cameras = devices['stickup_cams'] if 'stickup_cams' in devices else []
+        return list(doorbells) + list(cameras)
     
     def _initialize_event_tracking(self):
         """Get initial event IDs to avoid sending notifications for old events"""
-        print("\nInitializing event tracking...")
-        
-        devices = self.ring.devices()
-        
-        # Access doorbells from devices dict
-        if 'doorbots' in devices:
-            for doorbell in devices['doorbots']:
-                history = doorbell.history(limit=1)
-                if history:
-                    self.last_event_ids[doorbell.id] = history[0]['id']
-                    print(f"  {doorbell.name}: Last event ID {history[0]['id']}")
-        
-        # Access cameras from devices dict
-        if 'stickup_cams' in devices:
-            for camera in devices['stickup_cams']:
-                history = camera.history(limit=1)
-                if history:
-                    self.last_event_ids[camera.id] = history[0]['id']
-                    print(f"  {camera.name}: Last event ID {history[0]['id']}")
+        logger.info("Initializing event tracking...")
+        
+        # Mark the same window of events the poll checks as seen
+        history_by_device = self._fetch_account_history()
+        for device in self._all_devices():
+            history = history_by_device.get(device.id)
+            self._seen[device.id]  # Register the device even if it has no events yet
+            if history:
+                for event in history:
+                    self._mark_seen(device.id, event['id'])
+                logger.info("  %s: Last event ID %s", device.name, history[0]['id'])
     
-    def get_storage_usage_gb(self):
-        """Calculate total storage used by downloaded videos"""
+    def _mark_seen(self, device_id, event_id):
+        """Remember an event ID, forgetting the oldest once SEEN_EVENTS_MAX is reached"""
+        seen = self._seen[device_id]
+        seen_set = self._seen_set[device_id]
+        if len(seen) == seen.maxlen:
+            seen_set.discard(seen[0])
+        seen.append(event_id)
+        seen_set.add(event_id)
+    
+    def _scan_storage(self):
+        """Build storage accounting from the videos directory (run once at startup)"""
         total_size = 0
-        if self.videos_path.exists():
-            for file in self.videos_path.rglob('*'):
-                if file.is_file():
-                    total_size += file.stat().st_size
-        return total_size / (1024**3)  # Convert to GB
+        video_heap = []
+        for entry in _walk(self.videos_path):
+            stat = entry.stat()
+            total_size += stat.st_size
+            if entry.name.endswith('.mp4'):
+                video_heap.append((stat.st_mtime, Path(entry.path)))
+        heapq.heapify(video_heap)
+        
+        with self._storage_lock:
+            self._storage_bytes = total_size
+            self._video_heap = video_heap
+    
+    def _track_file(self, path):
+        """Add a newly written file to the storage accounting"""
+        path = Path(path)
+        stat = path.stat()
+        with self._storage_lock:
+            self._storage_bytes += stat.st_size
+            if path.suffix == '.mp4':
+                heapq.heappush(self._video_heap, (stat.st_mtime, path))
+    
+    def get_storage_usage_gb(self):
+        """Return total storage used by downloaded videos"""
+        return self._storage_bytes / (1024**3)  # Convert to GB
     
     def cleanup_old_videos(self):
         """Remove oldest videos if storage limit exceeded"""
         current_usage = self.get_storage_usage_gb()
         
         if current_usage > MAX_STORAGE_GB:
-            print(f"[{datetime.now()}] Storage limit exceeded ({current_usage:.2f}GB / {MAX_STORAGE_GB}GB)")
-            print("Cleaning up oldest videos...")
+            logger.info("Storage limit exceeded (%.2fGB / %sGB)", current_usage, MAX_STORAGE_GB)
+            logger.info("Cleaning up oldest videos...")
             
-            video_files = []
-            for file in self.videos_path.rglob('*.mp4'):
-                if file.is_file():
-                    video_files.append((file, file.stat().st_mtime))
-            
-            video_files.sort(key=lambda x: x[1])  # Sort by oldest first
-            
-            while current_usage > MAX_STORAGE_GB * 0.9 and video_files:
-                oldest_file, _ = video_files.pop(0)
-                file_size_gb = oldest_file.stat().st_size / (1024**3)
-                oldest_file.unlink()
-                current_usage -= file_size_gb
-                print(f"  Deleted: {oldest_file.name} ({file_size_gb:.2f}GB)")
+            with self._storage_lock:
+                while self._storage_bytes > MAX_STORAGE_GB * 0.9 * (1024**3) and self._video_heap:
+                    _, oldest_file = heapq.heappop(self._video_heap)
+                    try:
+                        file_size = oldest_file.stat().st_size
+                        oldest_file.unlink()
+                    except FileNotFoundError:
+                        continue  # Already removed outside the notifier
+                    self._storage_bytes -= file_size
+                    logger.info("  Deleted: %s (%.2fGB)", oldest_file.name, file_size / (1024**3))
             
-            print(f"✓ Cleanup complete. Current usage: {current_usage:.2f}GB")
+            current_usage = self.get_storage_usage_gb()
+            logger.info("✓ Cleanup complete. Current usage: %.2fGB", current_usage)
+    
+    def _safe_name(self, device):
+        """Return the device name made safe for filenames (computed once per device)"""
+        name = self._safe_names.get(device.id)
+        if name is None:
+            name = self._safe_names[device.id] = device.name.replace(' ', '_').replace('/', '_')
+        return name
     
-    def download_video(self, device, event):
-        """Download video for a specific event"""
+    def _write_file(self, path, data):
+        """Write bytes (or an iterable of byte chunks) to path as a single buffer"""
+        buf = data if isinstance(data, (bytes, bytearray)) else b''.join(data)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(buf)
+            while view:  # os.write may write less than asked
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    
+    def download_video(self, device, event, on_head=None, timestamp=None):
+        """
+        Download video for a specific event
+        on_head: Optional callback(filepath, head_bytes) called once the first
+                 FRAME_HEAD_BYTES have arrived, while the rest is still streaming
+        timestamp: Optional filename timestamp, shared with the event's snapshot
+        """
         if not DOWNLOAD_VIDEOS:
             return None
         
@@ -185,45 +405,78 @@ class RingPushoverNotifier:
             recording_url = event.get('recording', {}).get('status')
             
             if not recording_url or recording_url != 'ready':
-                print(f"  Video not ready yet for event {event['id']}")
+                logger.info("  Video not ready yet for event %s", event['id'])
                 return None
             
             video_url = device.recording_url(event['id'])
             
             if not video_url:
-                print(f"  No video URL available for event {event['id']}")
+                logger.info("  No video URL available for event %s", event['id'])
                 return None
             
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            device_name = device.name.replace(' ', '_').replace('/', '_')
+            timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
             event_kind = event.get('kind', 'unknown')
-            filename = f"{timestamp}_{device_name}_{event_kind}_{event['id']}.mp4"
+            filename = f"{timestamp}_{self._safe_name(device)}_{event_kind}_{event['id']}.mp4"
             filepath = self.videos_path / filename
             
-            print(f"  Downloading video to {filename}...")
-            
-            response = requests.get(video_url, stream=True)
-            response.raise_for_status()
+            logger.debug("  Downloading video to %s...", filename)
             
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with self._ring_session.get(video_url, stream=True, timeout=(5, 60)) as response:
+                response.raise_for_status()
+                
+                response.raw.decode_content = True
+                with open(filepath, 'wb') as f:
+                    if on_head:
+                        head = response.raw.read(FRAME_HEAD_BYTES)
+                        f.write(head)
+                        on_head(filepath, head)
+                    shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_BYTES)
             
+            self._track_file(filepath)
             file_size_mb = filepath.stat().st_size / (1024**2)
-            print(f"  ✓ Video saved ({file_size_mb:.2f}MB)")
+            logger.info("  ✓ Video saved (%.2fMB)", file_size_mb)
             
             return str(filepath)
             
         except Exception as e:
-            print(f"  Error downloading video: {e}")
+            logger.error("  Error downloading video: %s", e)
             return None
     
-    def extract_frame_from_video(self, video_path):
-        """Extract first frame from video as JPEG"""
+    def download_and_extract(self, device, event, timestamp=None):
+        """
+        Download video for an event, extracting its first frame from the
+        start of the stream instead of reopening the finished file
+        Returns (video_path, frame_path)
+        """
+        frame = {}
+        
+        def on_head(filepath, head):
+            try:
+                with tempfile.NamedTemporaryFile(suffix='.mp4') as tmp:
+                    tmp.write(head)
+                    tmp.flush()
+                    frame['path'] = self.extract_frame_from_video(str(filepath), source_path=tmp.name)
+            except Exception as e:
+                logger.debug("  ✗ Could not decode frame while streaming: %s", e)
+        
+        video_path = self.download_video(device, event, on_head=on_head, timestamp=timestamp)
+        frame_path = frame.get('path')
+        
+        # Some MP4s keep their index at the end, so decode the full file instead
+        if video_path and not frame_path:
+            frame_path = self.extract_frame_from_video(video_path)
+        
+        return video_path, frame_path
+    
+    def extract_frame_from_video(self, video_path, source_path=None):
+        """
+        Extract first frame from video as JPEG
+        source_path: Optional file to decode instead of video_path (e.g. a partial download)
+        """
         try:
             import cv2
             
-            cap = cv2.VideoCapture(video_path)
+            cap = cv2.VideoCapture(source_path or video_path)
             ret, frame = cap.read()
             cap.release()
             
@@ -231,18 +484,19 @@ class RingPushoverNotifier:
                 # Save frame as JPEG
                 frame_path = video_path.replace('.mp4', '_frame.jpg')
                 cv2.imwrite(frame_path, frame)
-                print(f"  ✓ Frame extracted: {os.path.basename(frame_path)}")
+                self._track_file(frame_path)
+                logger.info("  ✓ Frame extracted: %s", os.path.basename(frame_path))
                 return frame_path
             else:
-                print(f"  ✗ Could not read video frame")
+                logger.info("  ✗ Could not read video frame")
                 return None
                 
         except ImportError:
-            print(f"  ℹ opencv-python not installed, skipping frame extraction")
-            print(f"    Install with: pip install opencv-python")
+            logger.info("  ℹ opencv-python not installed, skipping frame extraction")
+            logger.info("    Install with: pip install opencv-python")
             return None
         except Exception as e:
-            print(f"  ✗ Frame extraction failed: {e}")
+            logger.error("  ✗ Frame extraction failed: %s", e)
             return None
     
     def send_pushover(self, title, message, priority=0, image_path=None):
@@ -264,40 +518,45 @@ class RingPushoverNotifier:
             files = {}
             if image_path and os.path.exists(image_path):
                 # Attach image to notification
-                files = {"attachment": ("image.jpg", open(image_path, "rb"), "image/jpeg")}
+                with open(image_path, "rb") as f:
+                    files = {"attachment": ("image.jpg", f.read(), "image/jpeg")}
             
-            response = requests.post(
+            response = self._pushover_session.post(
                 "https://api.pushover.net/1/messages.json",
                 data=data,
-                files=files
+                files=files,
+                timeout=30
             )
             
             if response.status_code == 200:
-                print(f"[{datetime.now()}] Pushover sent: {title}")
+                logger.info("Pushover sent: %s", title)
                 return True
             else:
-                print(f"[{datetime.now()}] Pushover error: {response.text}")
+                logger.error("Pushover error: %s", response.text)
                 return False
                 
         except Exception as e:
-            print(f"[{datetime.now()}] Error sending Pushover: {e}")
+            logger.error("Error sending Pushover: %s", e)
             return False
     
     def check_for_events(self):
-        """Check for new Ring events"""
+        """Check for new Ring events, returns True if any event was processed"""
+        self._event_fired = False
         try:
             self.ring.update_data()
-            devices = self.ring.devices()
-            
-            # Check doorbells
-            if 'doorbots' in devices:
-                for doorbell in devices['doorbots']:
-                    self._check_device_events(doorbell)
             
-            # Check cameras
-            if 'stickup_cams' in devices:
-                for camera in devices['stickup_cams']:
-                    self._check_device_events(camera)
+            # One request for every device's recent events, then process
+            # the devices that have any concurrently
+            history_by_device = self._fetch_account_history()
+            futures = [
+                self._pool.submit(self._check_device_events, d, history_by_device[d.id])
+                for d in self._all_devices() if d.id in history_by_device
+            ]
+            done, not_done = wait(futures, timeout=DEVICE_CHECK_TIMEOUT)
+            for future in done:
+                future.result()  # Re-raise any device error
+            if not_done:
+                raise TimeoutError(f"{len(not_done)} device check(s) still running after {DEVICE_CHECK_TIMEOUT}s")
             
             # Connection successful - check if we just recovered
             if not self.was_connected and self.connection_lost_time:
@@ -313,7 +572,7 @@ class RingPushoverNotifier:
                 else:
                     duration_str = f"{seconds} second{'s' if seconds != 1 else ''}"
                 
-                print(f"\n[{recovery_time}] Connection restored! (Was down for {duration_str})")
+                logger.info("Connection restored! (Was down for %s)", duration_str)
                 
                 self.send_pushover(
                     "Ring Connection Restored",
@@ -326,44 +585,80 @@ class RingPushoverNotifier:
                 self.was_connected = True
                 self.connection_lost_time = None
             
-            # Reset error counter on successful check
+            # Reset error counter and backoff on successful check
             self.consecutive_errors = 0
+            self._backoff_sleep = None
                 
         except Exception as e:
             self.consecutive_errors += 1
             
-            # Mark connection as lost after 3 consecutive errors (30 seconds)
+            # Truncated exponential backoff with jitter before the next retry
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * (2 ** min(self.consecutive_errors, 5)))
+            self._backoff_sleep = delay * (1 + random.uniform(0, BACKOFF_JITTER))
+            
+            # Mark connection as lost after 3 consecutive errors
             if self.was_connected and self.consecutive_errors >= 3:
                 self.connection_lost_time = datetime.now()
-                print(f"\n[{self.connection_lost_time}] Connection lost! Will notify when restored.")
+                logger.warning("Connection lost! Will notify when restored.")
                 self.was_connected = False
             
-            print(f"[{datetime.now()}] Error checking events ({self.consecutive_errors}): {e}")
+            logger.warning("Error checking events (%d), retrying in %.1fs: %s",
+                           self.consecutive_errors, self._backoff_sleep, e)
+        
+        return self._event_fired
     
-    def _check_device_events(self, device):
-        """Check a specific device for new events"""
-        history = device.history(limit=5)
+    def _fetch_account_history(self):
+        """Fetch recent events for all devices in one request, grouped by device ID (newest first)"""
+        devices = self._all_devices()
+        limit = max(ACCOUNT_HISTORY_LIMIT, HISTORY_LIMIT * len(devices))
+        events = self.ring.query(HISTORY_ENDPOINT, extra_params={'limit': limit}).json()
         
+        history_by_device = defaultdict(list)
+        for event in events:
+            history_by_device[event['doorbot']['id']].append(event)
+        
+        # A busy device can fill the page and crowd out another device's
+        # events, so fetch the devices left short on their own
+        if len(events) >= limit:
+            short = [d for d in devices if len(history_by_device.get(d.id, ())) < HISTORY_LIMIT]
+            for device, history in self._pool.map(lambda d: (d, d.history(limit=HISTORY_LIMIT)), short):
+                history_by_device[device.id] = history
+        
+        # Raw API times are UTC ISO strings; show local time like push events
+        for history in history_by_device.values():
+            for event in history:
+                if 'created_at' in event:
+                    event['created_at'] = _local_time(event['created_at'])
+        return history_by_device
+    
+    def _check_device_events(self, device, history):
+        """Check a device's recent history for new events"""
         if not history:
             return
         
-        latest_event_id = history[0]['id']
-        last_seen_id = self.last_event_ids.get(device.id)
-        
-        # If this is a new event
-        if last_seen_id != latest_event_id:
-            # Process all new events (in case we missed multiple)
+        new_events = []
+        with self._seen_lock:
+            # Device added since startup - record its history without notifying
+            if device.id not in self._seen:
+                for event in history:
+                    self._mark_seen(device.id, event['id'])
+                return
+            
+            # Process every event we haven't seen (in case we missed multiple),
+            # regardless of the order Ring returns them in
             for event in history:
-                if event['id'] == last_seen_id:
-                    break
+                if event['id'] in self._seen_set[device.id]:
+                    continue
                 
-                self._process_event(device, event)
-            
-            # Update last seen event
-            self.last_event_ids[device.id] = latest_event_id
+                self._mark_seen(device.id, event['id'])
+                new_events.append(event)
+        
+        for event in new_events:
+            self._process_event(device, event)
     
     def _process_event(self, device, event):
         """Process and send notification for an event"""
+        self._event_fired = True
         kind = event.get('kind', 'unknown')
         created_at = event.get('created_at', 'unknown time')
         
@@ -385,47 +680,36 @@ class RingPushoverNotifier:
             message = f"{kind} event\nTime: {created_at}"
             priority = 0
         
-        print(f"\n[{datetime.now()}] New event detected!")
-        print(f"  Device: {device.name}")
-        print(f"  Type: {kind}")
-        print(f"  Time: {created_at}")
+        logger.info("New event detected!\n  Device: %s\n  Type: %s\n  Time: %s", device.name, kind, created_at)
+        
+        # One timestamp names both the snapshot and the video of this event
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         # Try to capture snapshot
         snapshot_path = None
         try:
             # Get latest snapshot from Ring
             if hasattr(device, 'get_snapshot'):
-                print(f"  Capturing snapshot...")
+                logger.debug("  Capturing snapshot...")
                 snapshot_data = device.get_snapshot()
                 
                 if snapshot_data:
                     # Save snapshot temporarily
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    device_name = device.name.replace(' ', '_').replace('/', '_')
-                    snapshot_filename = f"{timestamp}_{device_name}_snapshot.jpg"
+                    snapshot_filename = f"{timestamp}_{self._safe_name(device)}_snapshot.jpg"
                     snapshot_path = self.videos_path / snapshot_filename
                     
-                    with open(snapshot_path, 'wb') as f:
-                        f.write(snapshot_data)
+                    self._write_file(snapshot_path, snapshot_data)
+                    self._track_file(snapshot_path)
                     
-                    print(f"  ✓ Snapshot saved: {snapshot_filename}")
+                    logger.info("  ✓ Snapshot saved: %s", snapshot_filename)
         except Exception as e:
-            print(f"  Snapshot capture failed: {e}")
+            logger.warning("  Snapshot capture failed: %s", e)
         
-        # Download video if enabled
-        video_path = None
+        # Queue video download so polling isn't blocked while it finishes
         if DOWNLOAD_VIDEOS and kind in ['ding', 'motion']:
-            print(f"  Waiting for video to be ready...")
-            time.sleep(5)
-            video_path = self.download_video(device, event)
-            
-            if video_path:
-                message += f"\n\nVideo saved locally"
-                
-                # If no snapshot, try extracting frame from video
-                if not snapshot_path:
-                    print(f"  No snapshot available, extracting frame from video...")
-                    snapshot_path = self.extract_frame_from_video(video_path)
+            logger.debug("  Video download queued")
+            message += "\n\nVideo will be saved locally"
+            self._video_queue.put((device, event, title, not snapshot_path, timestamp))
         
         # Send notification with snapshot if available
         self.send_pushover(title, message, priority, image_path=str(snapshot_path) if snapshot_path else None)
@@ -433,27 +717,56 @@ class RingPushoverNotifier:
         # Clean up snapshot after sending (optional - comment out if you want to keep them)
         # if snapshot_path and snapshot_path.exists():
         #     snapshot_path.unlink()
-        #     print(f"  Snapshot sent and deleted")
+        #     logger.info("  Snapshot sent and deleted")
+    
+    def _video_worker(self):
+        """Background thread that downloads queued event videos"""
+        while True:
+            device, event, title, need_frame, timestamp = self._video_queue.get()
+            try:
+                # Wait a moment for Ring to finish processing the video
+                time.sleep(5)
+                
+                # Push events carry no recording info, so look the event up in history
+                if 'recording' not in event:
+                    history = device.history(limit=HISTORY_LIMIT)
+                    event = next((e for e in history if e['id'] == event['id']), event)
+                if not need_frame:
+                    self.download_video(device, event, timestamp=timestamp)
+                    continue
+                
+                # The notification had no snapshot, so follow up with a frame from the video
+                logger.info("  No snapshot available, extracting frame from video...")
+                video_path, frame_path = self.download_and_extract(device, event, timestamp=timestamp)
+                if frame_path:
+                    self.send_pushover(title, "Video saved locally", image_path=frame_path)
+            except Exception as e:
+                logger.error("Error processing video for event %s: %s", event.get('id'), e)
+            finally:
+                self._video_queue.task_done()
     
     def get_stats(self):
         """Get statistics about stored videos"""
         if not self.videos_path.exists():
             return "No videos directory found"
         
-        video_count = len(list(self.videos_path.rglob('*.mp4')))
+        video_count = len(self._video_heap)
         storage_gb = self.get_storage_usage_gb()
         
         return f"Videos: {video_count} | Storage: {storage_gb:.2f}GB / {MAX_STORAGE_GB}GB"
     
     def run(self):
         """Main monitoring loop"""
+        push_enabled = self._start_listener()
+        
         print(f"\n{'='*50}")
         print("Ring Pushover Notifier with Video Recording")
         print(f"Video downloads: {'ENABLED' if DOWNLOAD_VIDEOS else 'DISABLED'}")
         if DOWNLOAD_VIDEOS:
             print(f"Videos directory: {self.videos_path.absolute()}")
             print(f"Max storage: {MAX_STORAGE_GB}GB")
-        print(f"Checking for events every {CHECK_INTERVAL} seconds")
+        print(f"Checking for events every {CHECK_INTERVAL}-{self._max_interval} seconds (adaptive)")
+        print(f"Push events: {'ENABLED' if push_enabled else 'DISABLED'}")
         print(f"Notifications via Pushover")
         print(f"Press Ctrl+C to stop")
         print(f"{'='*50}\n")
@@ -469,16 +782,29 @@ class RingPushoverNotifier:
         try:
             iteration = 0
             while True:
-                self.check_for_events()
+                # Poll quickly around activity, back off gradually when idle
+                if self.check_for_events():
+                    self._idle_interval = CHECK_INTERVAL
+                else:
+                    self._idle_interval = min(self._max_interval, self._idle_interval * 1.5)
                 
-                # Print stats every 100 iterations (~17 minutes at 10s intervals)
+                # Log stats every 100 iterations
                 iteration += 1
                 if iteration % 100 == 0 and DOWNLOAD_VIDEOS:
-                    print(f"\n[{datetime.now()}] {self.get_stats()}\n")
+                    logger.info("%s", self.get_stats())
                 
-                time.sleep(CHECK_INTERVAL)
+                # After a failure, wait out the backoff instead of the poll interval.
+                # While push events work, polling is only a slow safety net.
+                if self._backoff_sleep is not None:
+                    time.sleep(self._backoff_sleep)
+                elif self._listener is not None:
+                    time.sleep(LISTENER_HEARTBEAT_INTERVAL)
+                else:
+                    time.sleep(self._idle_interval)
         except KeyboardInterrupt:
-            print(f"\n[{datetime.now()}] Shutting down Ring Pushover Notifier...")
+            logger.info("Shutting down Ring Pushover Notifier...")
+            if self._listener:
+                self._listener.stop()
             final_title = "Ring Notifier Stopped"
             final_message = "Ring Pushover Notifier has been stopped."
             if DOWNLOAD_VIDEOS:
@@ -7,13 +7,28 @@ Monitors Ring doorbell/camera events, sends SMS alerts, and downloads videos
 import os
 import time
 import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import heapq
+import queue
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from ring_doorbell import Ring, Auth
+try:
+    from ring_doorbell.listen import RingEventListener
+except ImportError:  # ring-doorbell installed without the [listen] extra
+    RingEventListener = None
 from oauthlib.oauth2 import MissingTokenError
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -26,31 +41,106 @@ TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_FROM_NUMBER = os.getenv('TWILIO_FROM_NUMBER')
 TWILIO_TO_NUMBER = os.getenv('TWILIO_TO_NUMBER')
 TOKEN_FILE = 'ring_token.cache'
+FCM_CREDENTIALS_FILE = 'ring_fcm_credentials.cache'  # push notification registration
 CHECK_INTERVAL = 10  # seconds between checks
+DEVICE_REFRESH_INTERVAL = 600  # seconds between full Ring device data refreshes
+HISTORY_CATCHUP_LIMIT = 20  # events fetched once a device has something new
+LISTENER_HEARTBEAT_INTERVAL = 60  # seconds between fallback checks while push events work
 DOWNLOAD_VIDEOS = os.getenv('DOWNLOAD_VIDEOS', 'true').lower() == 'true'
 VIDEOS_DIR = os.getenv('VIDEOS_DIR', './ring_videos')
 MAX_STORAGE_GB = float(os.getenv('MAX_STORAGE_GB', '10'))  # Max storage in GB
+DOWNLOAD_CHUNK_BYTES = 1 << 20  # 1 MiB writes when saving videos
+DOWNLOAD_WORKERS = 2  # background threads downloading videos
+DOWNLOAD_QUEUE_SIZE = 32  # pending video downloads before new ones are dropped
+SMS_RATE = float(os.getenv('SMS_RATE', '1'))  # max SMS per second (1 for a long-code number)
+SMS_DEBOUNCE = 2  # seconds to collect events from one device into a single SMS
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+
+# Log through a queue so formatting and console I/O happen on a background thread
+logger = logging.getLogger("ring_notif")
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+logging.basicConfig(level=LOG_LEVEL, format="%(message)s", handlers=[QueueHandler(_log_queue)])
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+# SMS alert text by event kind
+_MSG = {
+    'ding': "🔔 Ring Alert: Doorbell pressed at {name}",
+    'motion': "👁️ Ring Alert: Motion detected at {name}",
+    'on_demand': "📹 Ring Alert: Live view started at {name}",
+}
+_MSG_DEFAULT = "🔔 Ring Alert: {kind} event at {name}"
+
+# Push actions that ring-doorbell's listener can report as the event kind
+_PUSH_KINDS = {
+    'com.ring.push.handle_new_ding': 'ding',
+    'com.ring.push.handle_new_motion': 'motion',
+}
+
+def _walk(path):
+    """Yield DirEntry objects for all files under path (stat info comes from the directory scan)"""
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
 
 class RingSMSNotifier:
     def __init__(self):
         self.ring = None
         self.twilio_client = None
+        self.http = None  # Shared connection pool for Twilio and video downloads
+        self.pool = None  # Worker threads for concurrent Ring history calls
+        self.dl_q = None  # (device, event) videos waiting to be downloaded
+        self.sms_q = queue.Queue()  # (device_id, message, immediate) waiting to be sent
+        self.last_sent_ts = 0  # When the last SMS went out (monotonic)
         self.last_event_ids = {}
+        self._events_lock = threading.Lock()  # Guards last_event_ids between the push listener and polling
+        self._startup_devices = set()  # IDs of devices whose history was checked at startup
+        self._all_devices = []  # Doorbells and cameras, rebuilt after each update_data()
+        self._last_update = None  # When device data was last refreshed (monotonic)
+        self.listener = None  # Push event listener, None when polling
         self.videos_path = Path(VIDEOS_DIR)
+        self._storage_lock = threading.Lock()  # Guards the storage accounting below
+        self._total_bytes = 0  # Running total of bytes in the videos directory
+        self._video_heap = []  # (mtime, path) of stored videos, oldest first
         self.initialize()
     
     def initialize(self):
         """Initialize Ring and Twilio connections"""
-        print(f"[{datetime.now()}] Initializing Ring SMS Notifier...")
+        logger.info("Initializing Ring SMS Notifier...")
         
         # Create videos directory if it doesn't exist
         if DOWNLOAD_VIDEOS:
             self.videos_path.mkdir(parents=True, exist_ok=True)
-            print(f"✓ Videos directory created: {self.videos_path.absolute()}")
+            logger.info("✓ Videos directory created: %s", self.videos_path.absolute())
+            self._scan_storage()
+        
+        self.pool = ThreadPoolExecutor(max_workers=8)
+        
+        # Video downloads happen in the background so alerts never wait on them
+        self.dl_q = queue.Queue(maxsize=DOWNLOAD_QUEUE_SIZE)
+        for _ in range(DOWNLOAD_WORKERS):
+            threading.Thread(target=self._dl_worker, daemon=True).start()
+        
+        # Pooled HTTP session, retrying idempotent requests on transient errors
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504))
+        ))
         
-        # Initialize Twilio
-        self.twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-        print("✓ Twilio client initialized")
+        # Initialize Twilio on the shared session so SMS reuse its connections
+        twilio_http = TwilioHttpClient()
+        twilio_http.session = self.http
+        self.twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, http_client=twilio_http)
+        threading.Thread(target=self._sms_worker, daemon=True).start()
+        logger.info("✓ Twilio client initialized")
         
         # Initialize Ring authentication
         auth = Auth("MyRingSMSApp/1.0", None, token_updater=self.token_updated)
@@ -59,76 +149,166 @@ class RingSMSNotifier:
             # Try to load existing token
             auth.fetch_token(RING_USERNAME, RING_PASSWORD)
         except MissingTokenError:
-            print("No cached token found, performing initial authentication...")
+            logger.info("No cached token found, performing initial authentication...")
             auth.fetch_token(RING_USERNAME, RING_PASSWORD)
         
         self.ring = Ring(auth)
-        self.ring.update_data()
-        print("✓ Ring client initialized")
+        doorbells, cameras = self._refresh_devices()
+        logger.info("✓ Ring client initialized")
         
         # List devices
-        devices = self.ring.devices()
-        print(f"\nFound {len(devices.get('doorbots', []))} doorbell(s)")
-        print(f"Found {len(devices.get('stickup_cams', []))} camera(s)")
+        logger.info("Found %s doorbell(s)", len(doorbells))
+        logger.info("Found %s camera(s)", len(cameras))
         
         # Initialize last event tracking
         self._initialize_event_tracking()
     
+    def _refresh_devices(self):
+        """Reload Ring device data and rebuild the doorbell/camera list, returns (doorbells, cameras)"""
+        self.ring.update_data()
+        
+        # RingDevices acts like a dict but has no .get()
+        devices = self.ring.devices()
+        doorbells = list(devices['doorbots']) if 'doorbots' in devices else []
+        cameras = list(devices['stickup_cams']) if 'stickup_cams' in devices else []
+        self._all_devices = doorbells + cameras
+        self._last_update = time.monotonic()
+        return doorbells, cameras
+    
     def token_updated(self, token):
         """Callback to save updated Ring token"""
-        with open(TOKEN_FILE, 'w') as f:
-            json.dump(token, f)
-        print(f"[{datetime.now()}] Token updated and saved")
+        self._write_json(TOKEN_FILE, token)
+        logger.info("Token updated and saved")
+    
+    def _write_json(self, path, data):
+        """Save JSON via a temp file and rename so a crash can't leave a corrupt file"""
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    
+    def _fcm_credentials_updated(self, credentials):
+        """Callback to save updated push notification credentials"""
+        self._write_json(FCM_CREDENTIALS_FILE, credentials)
+        logger.info("Push credentials updated and saved")
+    
+    def _start_listener(self):
+        """Start receiving Ring push events, returns True if the listener is running"""
+        if RingEventListener is None:
+            logger.info("ℹ ring-doorbell[listen] not installed, using polling")
+            logger.info("  Install with: pip install 'ring-doorbell[listen]>=0.8.6,<0.9'")
+            return False
+        
+        credentials = None
+        if os.path.exists(FCM_CREDENTIALS_FILE):
+            try:
+                with open(FCM_CREDENTIALS_FILE, 'r') as f:
+                    credentials = json.load(f)
+            except Exception as e:
+                logger.warning("Could not load cached push credentials: %s", e)
+        
+        try:
+            self.listener = RingEventListener(self.ring, credentials, self._fcm_credentials_updated)
+            self.listener.add_notification_callback(self._on_push)
+            self.listener.start()
+        except Exception as e:
+            logger.warning("Could not start push event listener: %s", e)
+            self.listener = None
+            return False
+        
+        if not self.listener.started:
+            logger.warning("Push event listener failed to start, using polling")
+            self.listener = None
+            return False
+        
+        logger.info("✓ Listening for Ring push events")
+        return True
+    
+    def _on_push(self, ring_event):
+        """Handle a Ring push event (runs on the listener's thread)"""
+        try:
+            device = next((d for d in self._all_devices if d.id == ring_event.doorbot_id), None)
+            if device is None:
+                logger.warning("Push event %s for unknown device %s", ring_event.id, ring_event.doorbot_id)
+                return
+            
+            # Keep the polling fallback from reporting this event again
+            with self._events_lock:
+                if self.last_event_ids.get(device.id) == ring_event.id:
+                    return
+                self.last_event_ids[device.id] = ring_event.id
+            
+            event = {
+                'id': ring_event.id,
+                'kind': _PUSH_KINDS.get(ring_event.kind.lower(), ring_event.kind),
+                'created_at': datetime.fromtimestamp(ring_event.now).strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self._process_event(device, event)
+        except Exception as e:
+            logger.error("Error handling push event: %s", e)
     
     def _initialize_event_tracking(self):
         """Get initial event IDs to avoid sending notifications for old events"""
-        print("\nInitializing event tracking...")
-        for doorbell in self.ring.doorbells:
-            history = doorbell.history(limit=1)
+        logger.info("Initializing event tracking...")
+        futs = {self.pool.submit(d.history, limit=1): d for d in self._all_devices}
+        for fut in as_completed(futs):
+            device = futs[fut]
+            history = fut.result()
+            self._startup_devices.add(device.id)
             if history:
-                self.last_event_ids[doorbell.id] = history[0]['id']
-                print(f"  {doorbell.name}: Last event ID {history[0]['id']}")
+                self.last_event_ids[device.id] = history[0]['id']
+                logger.info("  %s: Last event ID %s", device.name, history[0]['id'])
+    
+    def _scan_storage(self):
+        """Build storage accounting from the videos directory (run once at startup)"""
+        total_size = 0
+        video_heap = []
+        for entry in _walk(self.videos_path):
+            stat = entry.stat()
+            total_size += stat.st_size
+            if entry.name.endswith('.mp4'):
+                video_heap.append((stat.st_mtime, Path(entry.path)))
+        heapq.heapify(video_heap)
         
-        for camera in self.ring.stickup_cams:
-            history = camera.history(limit=1)
-            if history:
-                self.last_event_ids[camera.id] = history[0]['id']
-                print(f"  {camera.name}: Last event ID {history[0]['id']}")
+        with self._storage_lock:
+            self._total_bytes = total_size
+            self._video_heap = video_heap
+    
+    def _track_file(self, path):
+        """Add a newly downloaded video to the storage accounting"""
+        stat = path.stat()
+        with self._storage_lock:
+            self._total_bytes += stat.st_size
+            heapq.heappush(self._video_heap, (stat.st_mtime, path))
     
     def get_storage_usage_gb(self):
-        """Calculate total storage used by downloaded videos"""
-        total_size = 0
-        if self.videos_path.exists():
-            for file in self.videos_path.rglob('*'):
-                if file.is_file():
-                    total_size += file.stat().st_size
-        return total_size / (1024**3)  # Convert to GB
+        """Return total storage used by downloaded videos"""
+        return self._total_bytes / (1024**3)  # Convert to GB
     
     def cleanup_old_videos(self):
         """Remove oldest videos if storage limit exceeded"""
         current_usage = self.get_storage_usage_gb()
         
         if current_usage > MAX_STORAGE_GB:
-            print(f"[{datetime.now()}] Storage limit exceeded ({current_usage:.2f}GB / {MAX_STORAGE_GB}GB)")
-            print("Cleaning up oldest videos...")
-            
-            # Get all video files sorted by modification time
-            video_files = []
-            for file in self.videos_path.rglob('*.mp4'):
-                if file.is_file():
-                    video_files.append((file, file.stat().st_mtime))
-            
-            video_files.sort(key=lambda x: x[1])  # Sort by oldest first
+            logger.info("Storage limit exceeded (%.2fGB / %sGB)", current_usage, MAX_STORAGE_GB)
+            logger.info("Cleaning up oldest videos...")
             
             # Delete oldest files until under limit
-            while current_usage > MAX_STORAGE_GB * 0.9 and video_files:  # Keep 10% buffer
-                oldest_file, _ = video_files.pop(0)
-                file_size_gb = oldest_file.stat().st_size / (1024**3)
-                oldest_file.unlink()
-                current_usage -= file_size_gb
-                print(f"  Deleted: {oldest_file.name} ({file_size_gb:.2f}GB)")
+            with self._storage_lock:
+                while self._total_bytes > MAX_STORAGE_GB * 0.9 * (1024**3) and self._video_heap:  # Keep 10% buffer
+                    _, oldest_file = heapq.heappop(self._video_heap)
+                    try:
+                        file_size = oldest_file.stat().st_size
+                        oldest_file.unlink()
+                    except FileNotFoundError:
+                        continue  # Already removed outside the notifier
+                    self._total_bytes -= file_size
+                    logger.info("  Deleted: %s (%.2fGB)", oldest_file.name, file_size / (1024**3))
             
-            print(f"✓ Cleanup complete. Current usage: {current_usage:.2f}GB")
+            current_usage = self.get_storage_usage_gb()
+            logger.info("✓ Cleanup complete. Current usage: %.2fGB", current_usage)
     
     def download_video(self, device, event):
         """Download video for a specific event"""
@@ -143,14 +323,14 @@ class RingSMSNotifier:
             recording_url = event.get('recording', {}).get('status')
             
             if not recording_url or recording_url != 'ready':
-                print(f"  Video not ready yet for event {event['id']}")
+                logger.info("  Video not ready yet for event %s", event['id'])
                 return None
             
             # Ring API requires fetching the video URL
             video_url = device.recording_url(event['id'])
             
             if not video_url:
-                print(f"  No video URL available for event {event['id']}")
+                logger.info("  No video URL available for event %s", event['id'])
                 return None
             
             # Create filename with timestamp and device name
@@ -160,68 +340,134 @@ class RingSMSNotifier:
             filename = f"{timestamp}_{device_name}_{event_kind}_{event['id']}.mp4"
             filepath = self.videos_path / filename
             
-            print(f"  Downloading video to {filename}...")
+            logger.debug("  Downloading video to %s...", filename)
             
-            # Download the video
-            response = requests.get(video_url, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Download the video (already compressed, so ask for no transfer encoding)
+            with self.http.get(video_url, stream=True, timeout=(5, 60), headers={'Accept-Encoding': 'identity'}) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(filepath, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_BYTES)
             
+            self._track_file(filepath)
             file_size_mb = filepath.stat().st_size / (1024**2)
-            print(f"  ✓ Video saved ({file_size_mb:.2f}MB)")
+            logger.info("  ✓ Video saved (%.2fMB)", file_size_mb)
             
             return str(filepath)
             
         except Exception as e:
-            print(f"  Error downloading video: {e}")
+            logger.error("  Error downloading video: %s", e)
             return None
     
-    def send_sms(self, message):
-        """Send SMS via Twilio"""
+    def send_sms(self, message, device_id=None, immediate=True):
+        """
+        Queue an SMS for the rate-limited sender
+        device_id: Events from the same device within SMS_DEBOUNCE seconds are
+                   combined into one SMS, unless immediate is True
+        """
+        self.sms_q.put((device_id, message, immediate))
+        return True
+    
+    def _sms_worker(self):
+        """Background thread that debounces queued messages and sends them at SMS_RATE"""
+        pending = {}  # device_id -> (first queued time, [messages])
+        while True:
+            timeout = None
+            if pending:
+                oldest = min(first for first, _ in pending.values())
+                timeout = max(0, oldest + SMS_DEBOUNCE - time.monotonic())
+            
+            flush_all = False
+            try:
+                device_id, message, immediate = self.sms_q.get(timeout=timeout)
+            except queue.Empty:
+                device_id = message = None
+            
+            if message is not None:
+                if device_id is None:
+                    # Status messages go out after any alerts queued before them
+                    flush_all = True
+                else:
+                    first, messages = pending.setdefault(device_id, (time.monotonic(), []))
+                    messages.append(message)
+                    if immediate:
+                        pending[device_id] = (float('-inf'), messages)
+            
+            # Keep the worker alive if a send fails, or every later alert is lost
+            try:
+                now = time.monotonic()
+                for key in [k for k, (first, _) in pending.items() if flush_all or now - first >= SMS_DEBOUNCE]:
+                    _, messages = pending.pop(key)
+                    self._deliver_sms("\n\n".join(messages))
+                
+                if message is not None and device_id is None:
+                    self._deliver_sms(message)
+            except Exception as e:
+                logger.error("Error sending SMS: %s", e)
+            finally:
+                if message is not None:
+                    self.sms_q.task_done()
+    
+    def _deliver_sms(self, message):
+        """Send SMS via Twilio, waiting if needed to stay under SMS_RATE"""
+        wait = 1 / SMS_RATE - (time.monotonic() - self.last_sent_ts)
+        if wait > 0:
+            time.sleep(wait)
+        self.last_sent_ts = time.monotonic()
+        
         try:
             msg = self.twilio_client.messages.create(
                 body=message,
                 from_=TWILIO_FROM_NUMBER,
                 to=TWILIO_TO_NUMBER
             )
-            print(f"[{datetime.now()}] SMS sent: {msg.sid}")
+            logger.info("SMS sent: %s", msg.sid)
             return True
         except Exception as e:
-            print(f"[{datetime.now()}] Error sending SMS: {e}")
+            logger.error("Error sending SMS: %s", e)
             return False
     
     def check_for_events(self):
         """Check for new Ring events"""
         try:
-            self.ring.update_data()
-            
-            # Check doorbells
-            for doorbell in self.ring.doorbells:
-                self._check_device_events(doorbell)
+            # The device list rarely changes, so only refresh it every few minutes
+            if self._last_update is None or time.monotonic() - self._last_update >= DEVICE_REFRESH_INTERVAL:
+                self._refresh_devices()
             
-            # Check cameras
-            for camera in self.ring.stickup_cams:
-                self._check_device_events(camera)
+            # Fetch the latest event of all doorbells and cameras at once
+            futs = {self.pool.submit(d.history, limit=1): d for d in self._all_devices}
+            for fut in as_completed(futs):
+                self._check_device_events(futs[fut], fut.result())
                 
         except Exception as e:
-            print(f"[{datetime.now()}] Error checking events: {e}")
+            self._last_update = None  # Refresh device data on the next check
+            logger.error("Error checking events: %s", e)
     
-    def _check_device_events(self, device):
-        """Check a specific device for new events"""
-        history = device.history(limit=5)
-        
+    def _check_device_events(self, device, history):
+        """Check a device for new events, given its latest event from history(limit=1)"""
         if not history:
             return
         
         latest_event_id = history[0]['id']
-        last_seen_id = self.last_event_ids.get(device.id)
+        with self._events_lock:
+            last_seen_id = self.last_event_ids.get(device.id)
+            
+            # Device added since startup - record its history without alerting
+            if last_seen_id is None and device.id not in self._startup_devices:
+                self.last_event_ids[device.id] = latest_event_id
+                return
+            
+            # Claim the new event so a push for it isn't reported again
+            if last_seen_id != latest_event_id:
+                self.last_event_ids[device.id] = latest_event_id
         
         # If this is a new event
         if last_seen_id != latest_event_id:
-            # Process all new events (in case we missed multiple)
+            # Fetch more history to process all new events (in case we missed multiple)
+            history = device.history(limit=HISTORY_CATCHUP_LIMIT)
+            if not history:
+                return
+            latest_event_id = history[0]['id']
             for event in history:
                 if event['id'] == last_seen_id:
                     break
@@ -235,56 +481,69 @@ class RingSMSNotifier:
         """Process and send notification for an event"""
         kind = event.get('kind', 'unknown')
         created_at = event.get('created_at', 'unknown time')
+        name = device.name
         
         # Format the message based on event type
-        if kind == 'ding':
-            message = f"🔔 Ring Alert: Doorbell pressed at {device.name}"
-        elif kind == 'motion':
-            message = f"👁️ Ring Alert: Motion detected at {device.name}"
-        elif kind == 'on_demand':
-            message = f"📹 Ring Alert: Live view started at {device.name}"
-        else:
-            message = f"🔔 Ring Alert: {kind} event at {device.name}"
+        alert = _MSG.get(kind, _MSG_DEFAULT).format(name=name, kind=kind)
+        message = f"{alert}\nTime: {created_at}"
         
-        message += f"\nTime: {created_at}"
+        logger.info("New event detected!\n  Device: %s\n  Type: %s\n  Time: %s", name, kind, created_at)
         
-        print(f"\n[{datetime.now()}] New event detected!")
-        print(f"  Device: {device.name}")
-        print(f"  Type: {kind}")
-        print(f"  Time: {created_at}")
+        record_video = DOWNLOAD_VIDEOS and kind in ['ding', 'motion']
+        if record_video:
+            message += "\n📼 Video will be saved locally"
         
-        # Download video if enabled
-        video_path = None
-        if DOWNLOAD_VIDEOS and kind in ['ding', 'motion']:
-            # Wait a moment for Ring to finish processing the video
-            print(f"  Waiting for video to be ready...")
-            time.sleep(5)
-            video_path = self.download_video(device, event)
-            
-            if video_path:
-                message += f"\n📼 Video saved locally"
+        # Send the alert first, then hand the video to the download workers
+        self.send_sms(message, device_id=device.id, immediate=(kind == 'ding'))
         
-        self.send_sms(message)
+        if record_video:
+            try:
+                self.dl_q.put_nowait((device, event))
+                logger.debug("  Video download queued")
+            except queue.Full:
+                logger.warning("  Download queue full, skipping video for event %s", event['id'])
+    
+    def _dl_worker(self):
+        """Background thread that downloads queued event videos"""
+        while True:
+            device, event = self.dl_q.get()
+            try:
+                # Wait a moment for Ring to finish processing the video
+                time.sleep(5)
+                
+                # Push events carry no recording info, so look the event up in history
+                if 'recording' not in event:
+                    history = device.history(limit=5)
+                    event = next((e for e in history if e['id'] == event['id']), event)
+                
+                self.download_video(device, event)
+            except Exception as e:
+                logger.error("Error processing video for event %s: %s", event.get('id'), e)
+            finally:
+                self.dl_q.task_done()
     
     def get_stats(self):
         """Get statistics about stored videos"""
         if not self.videos_path.exists():
             return "No videos directory found"
         
-        video_count = len(list(self.videos_path.rglob('*.mp4')))
+        video_count = len(self._video_heap)
         storage_gb = self.get_storage_usage_gb()
         
         return f"Videos: {video_count} | Storage: {storage_gb:.2f}GB / {MAX_STORAGE_GB}GB"
     
     def run(self):
         """Main monitoring loop"""
+        push_enabled = self._start_listener()
+        
         print(f"\n{'='*50}")
         print("Ring SMS Notifier with Video Recording")
         print(f"Video downloads: {'ENABLED' if DOWNLOAD_VIDEOS else 'DISABLED'}")
         if DOWNLOAD_VIDEOS:
             print(f"Videos directory: {self.videos_path.absolute()}")
             print(f"Max storage: {MAX_STORAGE_GB}GB")
-        print(f"Checking for events every {CHECK_INTERVAL} seconds")
+        print(f"Push events: {'ENABLED' if push_enabled else 'DISABLED'}")
+        print(f"Polling fallback: every {LISTENER_HEARTBEAT_INTERVAL if push_enabled else CHECK_INTERVAL} seconds")
         print(f"Notifications will be sent to: {TWILIO_TO_NUMBER}")
         print(f"Press Ctrl+C to stop")
         print(f"{'='*50}\n")
@@ -300,18 +559,25 @@ class RingSMSNotifier:
             while True:
                 self.check_for_events()
                 
-                # Print stats every 100 iterations (~17 minutes at 10s intervals)
+                # Log stats every 100 iterations (~17 minutes at 10s intervals)
                 iteration += 1
                 if iteration % 100 == 0 and DOWNLOAD_VIDEOS:
-                    print(f"\n[{datetime.now()}] {self.get_stats()}\n")
+                    logger.info("%s", self.get_stats())
                 
-                time.sleep(CHECK_INTERVAL)
+                # While push events work, polling is only a slow safety net
+                time.sleep(LISTENER_HEARTBEAT_INTERVAL if push_enabled else CHECK_INTERVAL)
         except KeyboardInterrupt:
-            print(f"\n[{datetime.now()}] Shutting down Ring SMS Notifier...")
+            logger.info("Shutting down Ring SMS Notifier...")
+            if self.listener:
+                self.listener.stop()
             final_msg = "Ring SMS Notifier has been stopped."
             if DOWNLOAD_VIDEOS:
                 final_msg += f"\n{self.get_stats()}"
             self.send_sms(final_msg)
+            self.sms_q.join()  # Let queued alerts and the final message go out
+        finally:
+            self.pool.shutdown(wait=False)
+            self.http.close()
 
 def main():
     # Validate environment variables
@@ -330,6 +596,10 @@ def main():
         print("\nPlease create a .env file with these variables.")
         return
     
+    if SMS_RATE <= 0:
+        print("Error: SMS_RATE must be greater than 0")
+        return
+    
     notifier = RingSMSNotifier()
     notifier.run()
 
@@ -4,15 +4,26 @@ Simple web interface to view Ring videos
 Run this to browse videos from any device on your network
 """
 
-from flask import Flask, render_template_string, send_file, abort
+from flask import Flask, Response, stream_template_string, send_from_directory, abort
+from werkzeug.security import safe_join
+from urllib.parse import quote
 from pathlib import Path
 import os
+import re
+from functools import lru_cache
 from datetime import datetime
 
 VIDEOS_DIR = os.getenv('VIDEOS_DIR', './ring_videos')
+# Internal nginx location for VIDEOS_DIR (e.g. /_videos) to let nginx send the files
+VIDEOS_ACCEL_PREFIX = os.getenv('VIDEOS_ACCEL_PREFIX')
+# Filenames include the event ID, so a video at a given URL never changes
+VIDEO_CACHE_CONTROL = 'public, max-age=31536000, immutable'
 
 app = Flask(__name__)
 
+# Format: YYYYMMDD_HHMMSS_DeviceName_EventType_EventID.mp4
+_FN_RE = re.compile(r'^(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})_(.+?)_([A-Za-z]+)_\d+\.mp4$')
+
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
 <html>
@@ -101,7 +112,7 @@ HTML_TEMPLATE = '''
         <strong>Newest:</strong> {{ newest_date }}
     </div>
     
-    {% if videos %}
+    {% if video_count %}
     <div class="video-grid">
         {% for video in videos %}
         <div class="video-card">
@@ -134,24 +145,16 @@ HTML_TEMPLATE = '''
 
 def parse_filename(filename):
     """Parse information from Ring video filename"""
-    # Format: YYYYMMDD_HHMMSS_DeviceName_EventType_EventID.mp4
-    parts = filename.replace('.mp4', '').split('_')
+    m = _FN_RE.match(filename)
     
-    if len(parts) >= 4:
-        date_str = parts[0]
-        time_str = parts[1]
-        device = '_'.join(parts[2:-2]) if len(parts) > 4 else parts[2]
-        event_type = parts[-2]
-        
-        # Format date and time nicely
-        date = f"{date_str[4:6]}/{date_str[6:8]}/{date_str[0:4]}"
-        time = f"{time_str[0:2]}:{time_str[2:4]}:{time_str[4:6]}"
+    if m:
+        year, month, day, hour, minute, second, device, event_type = m.groups()
         
         return {
             'device': device.replace('_', ' '),
             'event_type': event_type.capitalize(),
-            'date': date,
-            'time': time
+            'date': f"{month}/{day}/{year}",
+            'time': f"{hour}:{minute}:{second}"
         }
     
     return {
@@ -161,6 +164,11 @@ def parse_filename(filename):
         'time': 'Unknown'
     }
 
+@lru_cache(maxsize=4096)
+def _parsed(filename):
+    """parse_filename, memoized across requests (filenames never change meaning)"""
+    return parse_filename(filename)
+
 @app.route('/')
 def index():
     videos_path = Path(VIDEOS_DIR)
@@ -168,51 +176,60 @@ def index():
     if not videos_path.exists():
         videos_path.mkdir(parents=True, exist_ok=True)
     
-    # Get all video files
-    video_files = list(videos_path.glob('*.mp4'))
-    video_files.sort(reverse=True)  # Newest first
+    # First pass: names and stats only, enough for the header stats
+    with os.scandir(videos_path) as it:
+        video_files = [(e.name, e.stat()) for e in it if e.name.endswith('.mp4') and e.is_file()]
+    video_files.sort(key=lambda f: f[0], reverse=True)  # Newest first
     
-    videos = []
-    total_size = 0
-    
-    for video_file in video_files:
-        info = parse_filename(video_file.name)
-        size_mb = video_file.stat().st_size / (1024 * 1024)
-        total_size += size_mb
-        
-        videos.append({
-            'filename': video_file.name,
-            'size_mb': f"{size_mb:.2f}",
-            **info
-        })
+    total_size = sum(stat.st_size for _, stat in video_files) / (1024 * 1024)
     
     # Get date range
     oldest_date = "N/A"
     newest_date = "N/A"
     if video_files:
-        oldest_date = datetime.fromtimestamp(video_files[-1].stat().st_mtime).strftime('%m/%d/%Y')
-        newest_date = datetime.fromtimestamp(video_files[0].stat().st_mtime).strftime('%m/%d/%Y')
+        oldest_date = datetime.fromtimestamp(video_files[-1][1].st_mtime).strftime('%m/%d/%Y')
+        newest_date = datetime.fromtimestamp(video_files[0][1].st_mtime).strftime('%m/%d/%Y')
+    
+    def videos():
+        """Build each card's details as the template reaches it"""
+        for name, stat in video_files:
+            yield {
+                'filename': name,
+                'size_mb': f"{stat.st_size / (1024 * 1024):.2f}",
+                **_parsed(name)
+            }
     
-    return render_template_string(
+    # Stream the page so the browser can render cards while the rest is generated
+    return Response(stream_template_string(
         HTML_TEMPLATE,
-        videos=videos,
-        video_count=len(videos),
+        videos=videos(),
+        video_count=len(video_files),
         total_size_mb=f"{total_size:.2f}",
         oldest_date=oldest_date,
         newest_date=newest_date
-    )
+    ), mimetype='text/html')
 
 @app.route('/video/<filename>')
 def serve_video(filename):
     """Serve video file"""
-    videos_path = Path(VIDEOS_DIR)
-    video_path = videos_path / filename
+    videos_path = Path(VIDEOS_DIR).resolve()
     
-    # Security check - ensure file is in videos directory
-    if not video_path.exists() or not video_path.is_relative_to(videos_path):
-        abort(404)
+    # Behind nginx, hand the transfer off after the same safety check
+    if VIDEOS_ACCEL_PREFIX:
+        video_path = safe_join(str(videos_path), filename)
+        if video_path is None or not os.path.isfile(video_path):
+            abort(404)
+        return Response(headers={
+            'X-Accel-Redirect': f"{VIDEOS_ACCEL_PREFIX.rstrip('/')}/{quote(filename)}",
+            'Content-Type': 'video/mp4',
+            'Cache-Control': VIDEO_CACHE_CONTROL
+        })
     
-    return send_file(video_path, mimetype='video/mp4')
+    # send_from_directory rejects paths outside the videos directory and
+    # supports Range requests, so players can fetch just what they need
+    response = send_from_directory(videos_path, filename, conditional=True, mimetype='video/mp4')
+    response.headers['Cache-Control'] = VIDEO_CACHE_CONTROL
+    return response
 
 if __name__ == '__main__':
     print(f"\n{'='*50}")
@@ -224,4 +241,11 @@ if __name__ == '__main__':
     print(f"\nPress Ctrl+C to stop")
     print(f"{'='*50}\n")
     
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+    # Serve requests from a thread pool so several videos can load at once
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=5000, threads=8, connection_limit=64)
+    except ImportError:
+        print("ℹ waitress not installed, using Flask's built-in server")
+        print("  Install with: pip install waitress")
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file